@@ -11,13 +11,16 @@ Usage:
                            [--learning-samples 5000]
                            [--retrain-interval 300]
                            [--log-file guardian_ml.log]
+                           [--fast-path]
                            [--verbose]
 """
 
 import argparse
-import collections
+import atexit
 import json
+import math
 import os
+import select
 import signal
 import socket
 import struct
@@ -25,15 +28,32 @@ import sys
 import time
 import threading
 from pathlib import Path
+from typing import NamedTuple
 
 import numpy as np
 from sklearn.ensemble import IsolationForest
 from sklearn.svm import OneClassSVM
 from sklearn.preprocessing import StandardScaler
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:  # orjson is optional; same compact output via json
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
 
 WIRE_FMT = "<QQQQQQQfff"
 WIRE_SIZE = struct.calcsize(WIRE_FMT)
+_WIRE_STRUCT = struct.Struct(WIRE_FMT)
 
 FIELD_NAMES = [
     "timestamp_ns",
@@ -52,6 +72,21 @@ FIELD_NAMES = [
 
 ROLLING_WINDOW = 32
 
+# Detection-phase samples are scored in micro-batches of up to this many rows,
+# flushed early once the oldest pending sample is this many seconds old
+PREDICT_BATCH_SIZE = 32
+PREDICT_FLUSH_INTERVAL = 0.1
+
+# --fast-path: samples inside an axis-aligned box of the scaled training data
+# are classified NORMAL without running either model. The box starts this many
+# std inside the training range on every side and is shrunk in the same steps
+# until no training sample the ensemble flags lies inside it
+FAST_PATH_MARGIN = 0.5
+FAST_PATH_MAX_MARGIN = 3.0
+
+# Maximum datagrams drained from the socket per poll() wakeup
+RECV_BATCH_SIZE = 64
+
 FEATURE_NAMES = [
     "cmr", "bmr", "ipc",
     "cmr_rmean", "bmr_rmean", "ipc_rmean",
@@ -61,70 +96,182 @@ FEATURE_NAMES = [
 ]
 
 
+@njit(cache=True, fastmath=True)
+def _push_kernel(cmr, bmr, ipc, ring, cursor, n, sums, sums2, prev, out):
+    """
+    Advance the rolling window by one sample and write the 14 features into out.
+    ring is (3, window); sums/sums2/prev hold per-metric state for cmr, bmr, ipc.
+    Returns the updated (cursor, n).
+    """
+    window = ring.shape[1]
+    out[0] = cmr
+    out[1] = bmr
+    out[2] = ipc
+
+    full = n == window
+    count = n if full else n + 1
+
+    for k in range(3):
+        v = out[k]
+        if full:
+            old = ring[k, cursor]
+            sums[k] -= old
+            sums2[k] -= old * old
+        ring[k, cursor] = v
+        sums[k] += v
+        sums2[k] += v * v
+
+        mean = sums[k] / count
+        sq_mean = sums2[k] / count
+        # var = E[x^2] - E[x]^2 leaves rounding residue (possibly negative) on
+        # a flat window; treat anything at that level as zero variance
+        var = sq_mean - mean * mean
+        out[3 + k] = mean
+        out[6 + k] = math.sqrt(var) if count > 1 and var > 1e-13 * sq_mean else 0.0
+        out[9 + k] = v - prev[k] if n > 0 else 0.0
+        prev[k] = v
+
+    out[12] = cmr * ipc
+    out[13] = bmr * ipc
+
+    cursor += 1
+    if cursor == window:
+        cursor = 0
+    return cursor, count
+
+
+@njit(cache=True, fastmath=True)
+def _push_scaled_kernel(cmr, bmr, ipc, ring, cursor, n, sums, sums2, prev, out,
+                        scale, shift, out_scaled, row):
+    """
+    _push_kernel, then write the standardized features into out_scaled[row]
+    so the batch handed to the models is built without another pass.
+    """
+    cursor, n = _push_kernel(cmr, bmr, ipc, ring, cursor, n, sums, sums2, prev, out)
+    for j in range(out.shape[0]):
+        out_scaled[row, j] = out[j] * scale[j] + shift[j]
+    return cursor, n
+
+
 class FeatureExtractor:
     """Maintains a rolling window and produces 14-dim feature vectors."""
 
     def __init__(self, window: int = ROLLING_WINDOW):
         self.window = window
-        self.buf_cmr = collections.deque(maxlen=window)
-        self.buf_bmr = collections.deque(maxlen=window)
-        self.buf_ipc = collections.deque(maxlen=window)
-        self.prev_cmr = None
-        self.prev_bmr = None
-        self.prev_ipc = None
+        # Per-metric state for cmr, bmr, ipc (rows/entries in that order)
+        self._ring = np.zeros((3, window), dtype=np.float64)
+        self._sums = np.zeros(3, dtype=np.float64)
+        self._sums2 = np.zeros(3, dtype=np.float64)
+        self._prev = np.zeros(3, dtype=np.float64)
+        self._cursor = 0
+        self._n = 0
+        self._out = np.empty(14, dtype=np.float64)
 
     def push(self, cmr: float, bmr: float, ipc: float) -> np.ndarray:
-        self.buf_cmr.append(cmr)
-        self.buf_bmr.append(bmr)
-        self.buf_ipc.append(ipc)
+        """
+        Returns the feature vector for this sample.
+        The array is a reused buffer overwritten on the next push — copy it
+        if it needs to outlive the current sample.
+        """
+        self._cursor, self._n = _push_kernel(
+            cmr, bmr, ipc, self._ring, self._cursor, self._n,
+            self._sums, self._sums2, self._prev, self._out,
+        )
+        return self._out
+
+    def push_scaled(self, cmr: float, bmr: float, ipc: float, scale: np.ndarray,
+                    shift: np.ndarray, out_scaled: np.ndarray, row: int) -> np.ndarray:
+        """
+        Same as push, additionally writing features * scale + shift into
+        out_scaled[row].
+        """
+        self._cursor, self._n = _push_scaled_kernel(
+            cmr, bmr, ipc, self._ring, self._cursor, self._n,
+            self._sums, self._sums2, self._prev, self._out,
+            scale, shift, out_scaled, row,
+        )
+        return self._out
 
-        cmr_arr = np.array(self.buf_cmr)
-        bmr_arr = np.array(self.buf_bmr)
-        ipc_arr = np.array(self.buf_ipc)
 
-        cmr_rmean = cmr_arr.mean()
-        bmr_rmean = bmr_arr.mean()
-        ipc_rmean = ipc_arr.mean()
 
-        cmr_rstd = cmr_arr.std() if len(cmr_arr) > 1 else 0.0
-        bmr_rstd = bmr_arr.std() if len(bmr_arr) > 1 else 0.0
-        ipc_rstd = ipc_arr.std() if len(ipc_arr) > 1 else 0.0
+class RbfSvmScorer:
+    """
+    Closed-form decision_function of a fitted RBF OneClassSVM.
+    Evaluates sum_i alpha_i * exp(-gamma * ||x - sv_i||^2) + intercept with two
+    small matmuls over the support vectors, bypassing libsvm's per-call overhead.
+    """
 
-        cmr_delta = cmr - self.prev_cmr if self.prev_cmr is not None else 0.0
-        bmr_delta = bmr - self.prev_bmr if self.prev_bmr is not None else 0.0
-        ipc_delta = ipc - self.prev_ipc if self.prev_ipc is not None else 0.0
+    def __init__(self, svm_model: OneClassSVM):
+        self.sv = np.ascontiguousarray(svm_model.support_vectors_, dtype=np.float64)
+        self.sv_sq = np.einsum("ij,ij->i", self.sv, self.sv)
+        self.coef = svm_model.dual_coef_.ravel().astype(np.float64)
+        self.intercept = float(svm_model.intercept_[0])
+        self.gamma = float(svm_model._gamma)
 
-        self.prev_cmr = cmr
-        self.prev_bmr = bmr
-        self.prev_ipc = ipc
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        X = X.astype(np.float64, copy=False)
+        d2 = np.einsum("ij,ij->i", X, X)[:, None] + self.sv_sq - 2.0 * (X @ self.sv.T)
+        np.maximum(d2, 0.0, out=d2)
+        return np.exp(-self.gamma * d2) @ self.coef + self.intercept
 
-        cmr_x_ipc = cmr * ipc
-        bmr_x_ipc = bmr * ipc
 
-        return np.array([
-            cmr, bmr, ipc,
-            cmr_rmean, bmr_rmean, ipc_rmean,
-            cmr_rstd, bmr_rstd, ipc_rstd,
-            cmr_delta, bmr_delta, ipc_delta,
-            cmr_x_ipc, bmr_x_ipc,
-        ], dtype=np.float64)
+
+class ModelBundle(NamedTuple):
+    """Everything predict needs from one training run, published as a unit."""
+    scaler: StandardScaler
+    # StandardScaler folded into one multiply-add, x * scale + shift, so
+    # predict can skip sklearn's input validation
+    scale: np.ndarray
+    shift: np.ndarray
+    if_model: IsolationForest
+    svm_model: OneClassSVM
+    svm_scorer: RbfSvmScorer
+    # Fast-path box in scaled units; None when the fast path is off
+    bb_lo: np.ndarray = None
+    bb_hi: np.ndarray = None
 
 
 
 class EnsembleDetector:
     """Isolation Forest + One-Class SVM ensemble with periodic retraining."""
 
-    def __init__(self, retrain_interval: float = 300.0, retrain_buffer_size: int = 10000):
-        self.if_model = None
-        self.svm_model = None
-        self.scaler = StandardScaler()
-        self.trained = False
+    def __init__(self, retrain_interval: float = 300.0, retrain_buffer_size: int = 10000,
+                 fast_path: bool = False):
+        self.fast_path = fast_path
+        # Replaced wholesale by train(). A single attribute store is atomic, so
+        # readers take a local reference without locking: they may score with
+        # the previous bundle during a retrain but never see a mix of the two.
+        self._bundle = None
 
         self.retrain_interval = retrain_interval
         self.retrain_buffer_size = retrain_buffer_size
-        self.retrain_buf = collections.deque(maxlen=retrain_buffer_size)
+        # Ring buffer of normal samples: rows [0, _rb_idx) are valid until it wraps
+        self._rb = np.empty((retrain_buffer_size, len(FEATURE_NAMES)), dtype=np.float64)
+        self._rb_idx = 0
+        self._rb_full = False
+        # Second ring swapped in while the first one is being trained on
+        self._rb_spare = np.empty_like(self._rb)
         self.last_train_time = 0.0
-        self._lock = threading.Lock()
+
+    @property
+    def trained(self) -> bool:
+        return self._bundle is not None
+
+    @property
+    def bundle(self):
+        return self._bundle
+
+    @property
+    def scaler(self):
+        return self._bundle.scaler if self._bundle else None
+
+    @property
+    def if_model(self):
+        return self._bundle.if_model if self._bundle else None
+
+    @property
+    def svm_model(self):
+        return self._bundle.svm_model if self._bundle else None
 
     def train(self, X: np.ndarray):
         """Train both models on the provided feature matrix."""
@@ -137,13 +284,18 @@ class EnsembleDetector:
 
         diversity_ok = self._check_diversity(X, X_scaled)
 
+        # Trees split on float32 internally; casting once up front avoids a
+        # conversion copy inside every fit/decision_function call
         if_model = IsolationForest(
-            n_estimators=200,
+            n_estimators=100,
+            max_samples=min(256, len(X)),
+            max_features=1.0,
             contamination=0.01,
             random_state=42,
             n_jobs=-1,
         )
-        if_model.fit(X_scaled)
+        X_if = X_scaled.astype(np.float32)
+        if_model.fit(X_if)
 
         svm_model = OneClassSVM(
             kernel="rbf",
@@ -151,19 +303,33 @@ class EnsembleDetector:
             nu=0.01,
         )
         svm_model.fit(X_scaled)
-
-        with self._lock:
-            self.scaler = scaler
-            self.if_model = if_model
-            self.svm_model = svm_model
-            self.trained = True
-            self.last_train_time = time.monotonic()
+        svm_scorer = RbfSvmScorer(svm_model)
+
+        scale = (1.0 / scaler.scale_).astype(np.float64)
+
+        bb_lo = bb_hi = None
+        if self.fast_path:
+            bb_lo, bb_hi = self._fit_normal_box(X_if, if_model, svm_scorer)
+
+        self._bundle = ModelBundle(
+            scaler=scaler,
+            scale=scale,
+            shift=-scaler.mean_ * scale,
+            if_model=if_model,
+            svm_model=svm_model,
+            svm_scorer=svm_scorer,
+            bb_lo=bb_lo,
+            bb_hi=bb_hi,
+        )
+        self.last_train_time = time.monotonic()
 
         n_features = X.shape[1]
         importances = if_model.feature_importances_ if hasattr(if_model, "feature_importances_") else None
         log_info(f"models trained on {len(X)} samples, {n_features} features, diversity={'OK' if diversity_ok else 'LOW'}")
         if importances is not None:
-            top_idx = np.argsort(importances)[::-1][:5]
+            k = min(5, len(importances))
+            top_idx = np.argpartition(importances, -k)[-k:]
+            top_idx = top_idx[np.argsort(importances[top_idx])[::-1]]
             top_str = ", ".join(f"{FEATURE_NAMES[i]}={importances[i]:.3f}" for i in top_idx if i < len(FEATURE_NAMES))
             log_info(f"top features: {top_str}")
 
@@ -172,33 +338,54 @@ class EnsembleDetector:
         Returns (level, composite_score, if_raw, svm_raw).
         level: "NORMAL", "WARNING", or "CRITICAL"
         """
-        with self._lock:
-            if not self.trained:
-                return "NORMAL", 0.0, 0.0, 0.0
-            scaler = self.scaler
-            if_model = self.if_model
-            svm_model = self.svm_model
-
-        x_scaled = scaler.transform(x.reshape(1, -1))
-
-        if_pred = if_model.predict(x_scaled)[0]       # 1=normal, -1=anomaly
-        svm_pred = svm_model.predict(x_scaled)[0]     # 1=normal, -1=anomaly
+        return self.predict_batch(x.reshape(1, -1))[0]
 
-        if_raw = if_model.decision_function(x_scaled)[0]
-        svm_raw = svm_model.decision_function(x_scaled)[0]
-
-        if_score = self._normalize_score(if_raw)
-        svm_score = self._normalize_score(svm_raw)
-        composite = 0.6 * if_score + 0.4 * svm_score
-
-        if if_pred == -1 and svm_pred == -1:
-            level = "CRITICAL"
-        elif if_pred == -1 or svm_pred == -1:
-            level = "WARNING"
-        else:
-            level = "NORMAL"
-
-        return level, float(composite), float(if_raw), float(svm_raw)
+    def predict_batch(self, X: np.ndarray, X_scaled: np.ndarray = None) -> list:
+        """
+        Score an (n, 14) batch with one call per model.
+        X_scaled may carry the rows already standardized with the current
+        bundle's scale/shift (see FeatureExtractor.push_scaled), as a
+        C-contiguous float32 array that sklearn accepts without converting.
+        Returns a list of (level, composite_score, if_raw, svm_raw), one per row.
+        """
+        bundle = self._bundle
+        if bundle is None:
+            return [("NORMAL", 0.0, 0.0, 0.0)] * len(X)
+
+        if X_scaled is None:
+            X_scaled = (X * bundle.scale + bundle.shift).astype(np.float32)
+
+        results = [("NORMAL", 0.0, 0.0, 0.0)] * len(X)
+        rows = range(len(X))
+        if bundle.bb_lo is not None:
+            inside = np.all((X_scaled >= bundle.bb_lo) & (X_scaled <= bundle.bb_hi), axis=1)
+            if inside.all():
+                return results
+            rows = np.flatnonzero(~inside)
+            X_scaled = X_scaled[rows]
+
+        # Labels follow from the raw scores (1=normal, -1=anomaly), so each
+        # model runs a single forward pass
+        if_raw = bundle.if_model.decision_function(X_scaled)
+        if_pred = np.where(if_raw >= 0.0, 1, -1)     # matches IsolationForest.predict
+
+        svm_raw = bundle.svm_scorer.decision_function(X_scaled)
+        svm_pred = np.where(svm_raw > 0.0, 1, -1)    # matches OneClassSVM.predict
+
+        for j, i in enumerate(rows):
+            ir = float(if_raw[j])
+            sr = float(svm_raw[j])
+            composite = 0.6 * self._normalize_score(ir) + 0.4 * self._normalize_score(sr)
+
+            if if_pred[j] == -1 and svm_pred[j] == -1:
+                level = "CRITICAL"
+            elif if_pred[j] == -1 or svm_pred[j] == -1:
+                level = "WARNING"
+            else:
+                level = "NORMAL"
+
+            results[i] = (level, composite, ir, sr)
+        return results
 
     def maybe_retrain(self):
         """Retrain if enough time has passed and buffer is large enough."""
@@ -207,34 +394,89 @@ class EnsembleDetector:
         elapsed = time.monotonic() - self.last_train_time
         if elapsed < self.retrain_interval:
             return
-        buf_snapshot = list(self.retrain_buf)
-        if len(buf_snapshot) < 200:
+        if self.retrain_buf_len < 200:
             return
-        X = np.array(buf_snapshot)
+
+        # Swap rings before training: samples added from here on land in the
+        # fresh ring instead of being cleared away afterwards, and the old
+        # ring is left untouched until the next swap, so it needs no copy
+        rb, idx, full = self._rb, self._rb_idx, self._rb_full
+        self._rb, self._rb_spare = self._rb_spare, rb
+        self._rb_idx = 0
+        self._rb_full = False
+
+        X = np.concatenate([rb[idx:], rb[:idx]]) if full else rb[:idx]
         log_info(f"periodic retraining on {len(X)} recent normal samples...")
         self.train(X)
-        self.retrain_buf.clear()
+
+    @property
+    def retrain_buf_len(self) -> int:
+        """Number of samples currently held in the retrain buffer."""
+        return self.retrain_buffer_size if self._rb_full else self._rb_idx
 
     def add_normal_sample(self, x: np.ndarray):
         """Buffer a sample that was classified as normal for future retraining."""
-        self.retrain_buf.append(x.copy())
+        if self.retrain_buffer_size == 0:
+            return
+        self._rb[self._rb_idx] = x
+        self._rb_idx = (self._rb_idx + 1) % self.retrain_buffer_size
+        if self._rb_idx == 0:
+            self._rb_full = True
 
     @staticmethod
     def _normalize_score(raw: float) -> float:
         """Map decision_function output to [0, 1] where 1 = most anomalous."""
-        return 1.0 / (1.0 + np.exp(raw))
+        # 1 / (1 + e^raw), arranged so exp() never overflows
+        if raw >= 0.0:
+            z = math.exp(-raw)
+            return z / (1.0 + z)
+        return 1.0 / (1.0 + math.exp(raw))
+
+    @staticmethod
+    def _fit_normal_box(X_scaled: np.ndarray, if_model, svm_scorer):
+        """
+        Fit the fast-path box to scaled training data. Returns (lo, hi), or
+        (None, None) if no box within FAST_PATH_MAX_MARGIN excludes every
+        training sample the ensemble would flag.
+        """
+        flagged = ((if_model.decision_function(X_scaled) < 0.0)
+                   | (svm_scorer.decision_function(X_scaled) <= 0.0))
+        lo0 = X_scaled.min(axis=0)
+        hi0 = X_scaled.max(axis=0)
+        margin = FAST_PATH_MARGIN
+        while margin <= FAST_PATH_MAX_MARGIN:
+            lo = lo0 + margin
+            hi = hi0 - margin
+            if np.any(lo > hi):
+                break
+            inside = np.all((X_scaled >= lo) & (X_scaled <= hi), axis=1)
+            if not np.any(inside & flagged):
+                log_info(f"fast path: margin={margin:.1f} std, "
+                         f"box covers {inside.mean():.1%} of training samples")
+                return lo, hi
+            margin += FAST_PATH_MARGIN
+        log_warn("fast path disabled for this model: no box excludes all flagged training samples")
+        return None, None
 
     @staticmethod
     def _check_diversity(X: np.ndarray, X_scaled: np.ndarray) -> bool:
         """Warn if training data lacks variance in any feature."""
-        stds = X.std(axis=0)
+        # One pass for mean and variance; einsum forms the sum of squares
+        # without materializing X*X. Rounding residue of E[x^2] - E[x]^2 on a
+        # constant column is treated as zero, as in _push_kernel.
+        n = X.shape[0]
+        sums = X.sum(axis=0)
+        sq_means = np.einsum("ij,ij->j", X, X) / n
+        means = sums / n
+        var = sq_means - means * means
+        stds = np.sqrt(np.where(var > 1e-13 * sq_means, var, 0.0))
         low_var_count = np.sum(stds < 1e-10)
         if low_var_count > 0:
             low_names = [FEATURE_NAMES[i] for i in range(len(stds)) if stds[i] < 1e-10 and i < len(FEATURE_NAMES)]
             log_warn(f"low-diversity features ({low_var_count}): {', '.join(low_names)}")
             log_warn("consider running diverse workloads during learning phase")
             return False
-        means = np.abs(X.mean(axis=0))
+        means = np.abs(means)
         cvs = np.where(means > 1e-12, stds / means, 0.0)
         low_cv = np.sum(cvs < 0.01)
         if low_cv > len(stds) // 2:
@@ -255,25 +497,25 @@ def build_alert(level: str, timestamp_ns: int, composite: float,
         "if_score": round(if_raw, 4),
         "svm_score": round(svm_raw, 4),
     }
-    return json.dumps(alert)
+    return _dumps(alert)
+
+
+# Stand-in rolling std for cmr, bmr, ipc when the window is flat
+_REASON_STD_FLOOR = np.array([1e-6, 1e-6, 0.01])
 
 
 def classify_reason(x: np.ndarray, scaler, if_model) -> str:
     """Heuristic: check which raw metrics are most deviant."""
     parts = []
-    cmr, bmr, ipc = x[0], x[1], x[2]
-    cmr_rmean = x[3]
-    bmr_rmean = x[4]
-    ipc_rmean = x[5]
-    cmr_rstd = x[6] if x[6] > 1e-12 else 1e-6
-    bmr_rstd = x[7] if x[7] > 1e-12 else 1e-6
-    ipc_rstd = x[8] if x[8] > 1e-12 else 0.01
-
-    if cmr_rstd > 0 and (cmr - cmr_rmean) / cmr_rstd > 3.0:
+    # z-scores of cmr, bmr, ipc against their rolling mean/std in one op
+    stds = np.where(x[6:9] > 1e-12, x[6:9], _REASON_STD_FLOOR)
+    z = (x[0:3] - x[3:6]) / stds
+
+    if z[0] > 3.0:
         parts.append("cache_miss_spike")
-    if bmr_rstd > 0 and (bmr - bmr_rmean) / bmr_rstd > 3.0:
+    if z[1] > 3.0:
         parts.append("branch_miss_spike")
-    if ipc_rstd > 0 and (ipc - ipc_rmean) / ipc_rstd < -3.0:
+    if z[2] < -3.0:
         parts.append("ipc_collapse")
 
     if not parts:
@@ -282,17 +524,20 @@ def classify_reason(x: np.ndarray, scaler, if_model) -> str:
     return " ".join(parts)
 
 
-_log_file = None
+# Log file stays open for the process lifetime; INFO lines are left in the
+# write buffer and flushed with the next WARN/alert or at exit
+_log_fp = None
 _verbose = False
 
 
-def _log(prefix: str, msg: str):
+def _log(prefix: str, msg: str, flush: bool = False):
     line = f"[guardian-ml] {prefix}: {msg}"
     print(line, file=sys.stderr, flush=True)
-    if _log_file:
+    if _log_fp:
         try:
-            with open(_log_file, "a") as f:
-                f.write(line + "\n")
+            _log_fp.write(line + "\n")
+            if flush:
+                _log_fp.flush()
         except OSError:
             pass
 
@@ -302,15 +547,15 @@ def log_info(msg: str):
 
 
 def log_warn(msg: str):
-    _log("WARN", msg)
+    _log("WARN", msg, flush=True)
 
 
 def log_alert(json_str: str):
     print(json_str, flush=True)
-    if _log_file:
+    if _log_fp:
         try:
-            with open(_log_file, "a") as f:
-                f.write(json_str + "\n")
+            _log_fp.write(json_str + "\n")
+            _log_fp.flush()
         except OSError:
             pass
 
@@ -323,23 +568,58 @@ def create_receiver_socket(socket_path: str) -> socket.socket:
 
     sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
     sock.bind(socket_path)
-    sock.settimeout(1.0)
+    # Non-blocking: the main loop waits with poll() and then drains in batches
+    sock.setblocking(False)
 
     log_info(f"listening on {socket_path} (wire size = {WIRE_SIZE} bytes)")
     return sock
 
 
-def unpack_sample(data: bytes) -> dict:
-    """Unpack binary datagram into a dict of field values."""
-    if len(data) < WIRE_SIZE:
-        return None
-    values = struct.unpack(WIRE_FMT, data[:WIRE_SIZE])
-    return dict(zip(FIELD_NAMES, values))
+def recv_batch(sock: socket.socket, bufs: list, sizes: list) -> int:
+    """
+    Read queued datagrams into bufs without blocking, one per buffer.
+    Each datagram's byte count goes into sizes; returns how many were read.
+    """
+    count = 0
+    for buf in bufs:
+        try:
+            sizes[count] = sock.recv_into(buf)
+        except (BlockingIOError, InterruptedError):
+            break
+        count += 1
+    return count
+
+
+def unpack_sample(data: bytes) -> tuple:
+    """Unpack binary datagram into a tuple of field values ordered as FIELD_NAMES."""
+    return _WIRE_STRUCT.unpack_from(data) if len(data) >= WIRE_SIZE else None
+
+
+
+def process_batch(detector: EnsembleDetector, X: np.ndarray, X_scaled: np.ndarray,
+                  timestamps: list) -> int:
+    """Score a batch of pending samples, emit alerts, and return the anomaly count."""
+    anomalies = 0
+    results = detector.predict_batch(X, X_scaled)
+    for x, ts, (level, composite, if_raw, svm_raw) in zip(X, timestamps, results):
+        if level == "NORMAL":
+            detector.add_normal_sample(x)
+            continue
+
+        anomalies += 1
+        reason = classify_reason(x, detector.scaler, detector.if_model)
+        alert_json = build_alert(level, ts, composite, if_raw, svm_raw, reason)
+        log_alert(alert_json)
+
+        if _verbose:
+            log_info(f"[{level}] score={composite:.4f} if={if_raw:.4f} "
+                     f"svm={svm_raw:.4f} reason={reason}")
+    return anomalies
 
 
 
 def main():
-    global _log_file, _verbose
+    global _log_fp, _verbose
 
     parser = argparse.ArgumentParser(description="CPU Guardian ML Detection Engine")
     parser.add_argument("--socket", default="/tmp/cpu-guardian.sock",
@@ -352,11 +632,19 @@ def main():
                         help="Max normal samples kept for retraining (default: 10000)")
     parser.add_argument("--log-file", default=None,
                         help="Write alerts and logs to this file")
+    parser.add_argument("--fast-path", action="store_true",
+                        help="Classify samples inside the box of normal training data as NORMAL "
+                             "without scoring them (faster; may miss anomalies inside the box)")
     parser.add_argument("--verbose", action="store_true",
                         help="Print every sample's detection result to stderr")
     args = parser.parse_args()
 
-    _log_file = args.log_file
+    if args.log_file:
+        try:
+            _log_fp = open(args.log_file, "a", buffering=1 << 16)
+            atexit.register(_log_fp.close)
+        except OSError as e:
+            log_warn(f"cannot open log file {args.log_file}: {e}")
     _verbose = args.verbose
 
     log_info("CPU Guardian ML engine starting")
@@ -379,70 +667,105 @@ def main():
     detector = EnsembleDetector(
         retrain_interval=args.retrain_interval,
         retrain_buffer_size=args.retrain_buffer,
+        fast_path=args.fast_path,
     )
 
-    learning_features = []
+    X_train = np.empty((args.learning_samples, len(FEATURE_NAMES)), dtype=np.float64)
+    learn_idx = 0
+    pending = np.empty((PREDICT_BATCH_SIZE, len(FEATURE_NAMES)), dtype=np.float64)
+    # Rows scaled with the bundle current at push time. Retraining only runs
+    # right after a flush, so pending rows never mix scalings.
+    pending_scaled = np.empty((PREDICT_BATCH_SIZE, len(FEATURE_NAMES)), dtype=np.float32)
+    pending_ts = []
+    pending_since = 0.0
     total_samples = 0
     anomaly_count = 0
     phase = "LEARNING"
 
     log_info(f"entering learning phase (collecting {args.learning_samples} samples)...")
 
+    recv_bufs = [bytearray(WIRE_SIZE) for _ in range(RECV_BATCH_SIZE)]
+    recv_sizes = [0] * RECV_BATCH_SIZE
+    poller = select.poll()
+    poller.register(sock, select.POLLIN)
+    poll_timeout_ms = 1000
+
     while not shutdown.is_set():
         try:
-            data, _ = sock.recvfrom(4096)
-        except socket.timeout:
-            if detector.trained:
-                detector.maybe_retrain()
-            continue
+            ready = poller.poll(poll_timeout_ms)
+            count = recv_batch(sock, recv_bufs, recv_sizes) if ready else 0
         except OSError:
             if shutdown.is_set():
                 break
             continue
 
-        sample = unpack_sample(data)
-        if sample is None:
+        if count == 0:
+            if pending_ts:
+                n = len(pending_ts)
+                anomaly_count += process_batch(detector, pending[:n], pending_scaled[:n], pending_ts)
+                pending_ts = []
+            if detector.trained:
+                detector.maybe_retrain()
             continue
 
-        total_samples += 1
-        cmr = sample["cache_miss_rate"]
-        bmr = sample["branch_miss_rate"]
-        ipc = sample["ipc"]
+        for i in range(count):
+            if recv_sizes[i] < WIRE_SIZE:
+                continue
+            sample = unpack_sample(recv_bufs[i])
+
+            total_samples += 1
+            cmr = sample[7]     # cache_miss_rate
+            bmr = sample[8]     # branch_miss_rate
+            ipc = sample[9]
+
+            # Reused buffer: copied only where the vector is retained
+            if phase == "LEARNING":
+                features = extractor.push(cmr, bmr, ipc)
+                if total_samples > ROLLING_WINDOW and learn_idx < args.learning_samples:
+                    X_train[learn_idx] = features
+                    learn_idx += 1
+
+                if learn_idx >= args.learning_samples:
+                    log_info(f"learning complete: {learn_idx} feature vectors collected")
+                    detector.train(X_train[:learn_idx])
+                    X_train = None
+                    phase = "DETECTION"
+                    # Wake often enough to flush a partial batch on a quiet socket
+                    poll_timeout_ms = int(PREDICT_FLUSH_INTERVAL * 1000)
+                    log_info("entering detection phase...")
+                continue
+
+            row = len(pending_ts)
+            bundle = detector.bundle
+            if bundle is None:
+                features = extractor.push(cmr, bmr, ipc)
+            else:
+                # Also writes the standardized row straight into the batch
+                features = extractor.push_scaled(cmr, bmr, ipc, bundle.scale,
+                                                 bundle.shift, pending_scaled, row)
+            pending[row] = features
+
+            now = time.monotonic()
+            if not pending_ts:
+                pending_since = now
+            pending_ts.append(sample[0])    # timestamp_ns
 
-        features = extractor.push(cmr, bmr, ipc)
+            if _verbose and total_samples % 1000 == 0:
+                log_info(f"status: {total_samples} samples, {anomaly_count} anomalies, "
+                         f"retrain_buf={detector.retrain_buf_len}")
 
-        if phase == "LEARNING":
-            if total_samples > ROLLING_WINDOW:
-                learning_features.append(features.copy())
+            if len(pending_ts) < PREDICT_BATCH_SIZE and now - pending_since < PREDICT_FLUSH_INTERVAL:
+                continue
 
-            if len(learning_features) >= args.learning_samples:
-                X_train = np.array(learning_features)
-                log_info(f"learning complete: {len(X_train)} feature vectors collected")
-                detector.train(X_train)
-                learning_features = None
-                phase = "DETECTION"
-                log_info("entering detection phase...")
-            continue
+            n = len(pending_ts)
+            anomaly_count += process_batch(detector, pending[:n], pending_scaled[:n], pending_ts)
+            pending_ts = []
 
-        level, composite, if_raw, svm_raw = detector.predict(features)
+            detector.maybe_retrain()
 
-        if level == "NORMAL":
-            detector.add_normal_sample(features)
-            if _verbose and total_samples % 1000 == 0:
-                log_info(f"status: {total_samples} samples, {anomaly_count} anomalies, "
-                         f"retrain_buf={len(detector.retrain_buf)}")
-        else:
-            anomaly_count += 1
-            reason = classify_reason(features, detector.scaler, detector.if_model)
-            alert_json = build_alert(level, sample["timestamp_ns"],
-                                     composite, if_raw, svm_raw, reason)
-            log_alert(alert_json)
-
-            if _verbose:
-                log_info(f"[{level}] score={composite:.4f} if={if_raw:.4f} "
-                         f"svm={svm_raw:.4f} reason={reason}")
-
-        detector.maybe_retrain()
+    if pending_ts:
+        n = len(pending_ts)
+        anomaly_count += process_batch(detector, pending[:n], pending_scaled[:n], pending_ts)
 
     sock.close()
     try: